@@ -0,0 +1,206 @@
+"""Run a scan outside Home Assistant.
+
+Runs library discovery, one full scan and the card render for every sensor
+the given configuration would create, then prints a JSON timing report:
+
+    python -m custom_components.jellyfin_upcoming_media \
+        --host jellyfin.local --api-key KEY --user-id ID --record scan.zip
+
+    python -m custom_components.jellyfin_upcoming_media \
+        --replay scan.zip --latency 0.05 --profile scan.prof
+
+Home Assistant has to be installed for the imports, but it is not started.
+"""
+import argparse
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_PORT, CONF_SSL
+
+from .client import DEFAULT_BURST, DEFAULT_RATE_LIMIT
+from .images import DEFAULT_IMAGE_FORMAT, IMAGE_FORMATS
+from .sensor import (
+    CONF_EPISODES,
+    CONF_GROUP_LIBRARIES,
+    CONF_IMAGE_FORMAT,
+    CONF_INCLUDE,
+    CONF_MAX,
+    CONF_PROCESS_IMAGES,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    CONF_USER_ID,
+    DOMAIN,
+    DOMAIN_DATA,
+    PLATFORM_SCHEMA,
+    create_client,
+    create_sensors,
+)
+from .transport import RecordingTransport, ReplayTransport
+
+
+class _Config:
+    """The parts of hass.config the integration uses."""
+
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+
+    def path(self, *path):
+        return os.path.join(self.config_dir, *path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog=f"python -m custom_components.{DOMAIN}",
+        description="Run discovery, one scan and the card render against a Jellyfin server.",
+    )
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8096)
+    parser.add_argument("--ssl", action="store_true")
+    parser.add_argument("--api-key", default="")
+    parser.add_argument("--user-id", default="")
+    parser.add_argument("--max", type=int, default=5)
+    parser.add_argument("--include", action="append", default=[], help="library name, repeatable")
+    parser.add_argument("--group-libraries", action="store_true")
+    parser.add_argument("--no-episodes", action="store_true")
+    parser.add_argument(
+        "--rate-limit", type=float, default=DEFAULT_RATE_LIMIT, help="requests per second, 0 disables"
+    )
+    parser.add_argument("--rate-limit-burst", type=int, default=DEFAULT_BURST)
+    parser.add_argument("--process-images", action="store_true")
+    parser.add_argument("--image-format", choices=list(IMAGE_FORMATS), default=DEFAULT_IMAGE_FORMAT)
+    parser.add_argument(
+        "--config-dir", help="where images are written, a temporary directory by default"
+    )
+    parser.add_argument("--record", metavar="PATH", help="record all responses to a fixture archive")
+    parser.add_argument("--replay", metavar="PATH", help="answer requests from a fixture archive")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to every replayed request"
+    )
+    parser.add_argument("--profile", metavar="PATH", help="write cProfile stats to PATH")
+    parser.add_argument("--tracemalloc", action="store_true", help="report memory use")
+    parser.add_argument("--report", metavar="PATH", help="write the JSON report to PATH instead of stdout")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if not args.replay and not (args.api_key and args.user_id):
+        parser.error("--api-key and --user-id are required unless replaying a fixture")
+    return args
+
+
+def run_scan(config, config_dir, transport=None):
+    """Discover the sensors, update and render each, and time every step."""
+    hass = SimpleNamespace(data={}, config=_Config(config_dir))
+    client = create_client(hass, config, transport)
+    hass.data[DOMAIN_DATA] = {"client": client}
+
+    try:
+        start = time.perf_counter()
+        sensors = list(create_sensors(hass, config, client))
+        report = {"discovery_seconds": time.perf_counter() - start, "sensors": []}
+
+        for entity in sensors:
+            start = time.perf_counter()
+            data = entity.fetch_data()
+            scan_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            entity.set_data(data)
+            render_seconds = time.perf_counter() - start
+
+            attributes = entity.extra_state_attributes
+            report["sensors"].append(
+                {
+                    "entity_id": entity.entity_id,
+                    "state": entity.state,
+                    "items": len(entity.data),
+                    "cards": max(len(attributes.get("data", [])) - 1, 0),
+                    "scan_seconds": scan_seconds,
+                    "render_seconds": render_seconds,
+                }
+            )
+    finally:
+        client.close()
+
+    return report
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    config = PLATFORM_SCHEMA(
+        {
+            "platform": DOMAIN,
+            CONF_HOST: args.host,
+            CONF_PORT: args.port,
+            CONF_SSL: args.ssl,
+            CONF_API_KEY: args.api_key or "fixture",
+            CONF_USER_ID: args.user_id or "fixture",
+            CONF_MAX: args.max,
+            CONF_INCLUDE: args.include,
+            CONF_GROUP_LIBRARIES: args.group_libraries,
+            CONF_EPISODES: not args.no_episodes,
+            CONF_RATE_LIMIT: args.rate_limit,
+            CONF_RATE_LIMIT_BURST: args.rate_limit_burst,
+            CONF_PROCESS_IMAGES: args.process_images,
+            CONF_IMAGE_FORMAT: args.image_format,
+        }
+    )
+
+    # Options that change which requests a scan makes.
+    options = {
+        key: config[key]
+        for key in (CONF_MAX, CONF_INCLUDE, CONF_GROUP_LIBRARIES, CONF_EPISODES, CONF_PROCESS_IMAGES)
+    }
+    transport = None
+    if args.record:
+        transport = RecordingTransport(args.record, options=options)
+    elif args.replay:
+        transport = ReplayTransport(args.replay, args.latency, options)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        report = run_scan(config, args.config_dir or tmp_dir, transport)
+        if profiler:
+            profiler.disable()
+        report["total_seconds"] = time.perf_counter() - start
+
+    if args.record:
+        transport.save()
+
+    if args.tracemalloc:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["memory"] = {"current_bytes": current, "peak_bytes": peak}
+
+    if profiler:
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,173 @@
 """Client."""
+import codecs
 import datetime
-import requests
+import functools
+import json
 import logging
-from io import BytesIO
+import threading
+import time
+
+from .models import MediaItem
+from .transport import RequestsTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Characters that may follow an array element.
+JSON_DELIMITERS = " \t\r\n,]"
+
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_BURST = 10
+
+# How long an image that Jellyfin or TVDB reported missing is not asked for.
+MISSING_IMAGE_TTL_SECONDS = 6 * 3600
+
+# Library types whose items may have TVDB artwork to fall back on.
+TVDB_MEDIA_TYPES = ("episode", "show", "movie")
+
+# TVDB artwork the card falls back to for missing images, per Jellyfin item
+# type: the TVDB media type, and the artwork type of each card image.
+TVDB_FALLBACKS = {
+    "Episode": ("episode", {"Primary_parent": "poster", "Primary": "poster"}),
+    "Series": ("show", {"Primary": "poster", "Backdrop": "background"}),
+    "Movie": ("movie", {"Primary": "poster", "Backdrop": "background"}),
+}
+
+# Image types the card renders, in the order they are fetched: every
+# poster of a library before any of its fanart. Other image types are not
+# fetched at all.
+IMAGE_TYPES = ("Primary", "Backdrop")
+
+# Image types also fetched for the parent; episodes show the parent poster.
+PARENT_IMAGE_TYPES = ("Primary",)
+
+
+def iter_json_array(chunks, limit):
+    """Yield at most limit elements of a JSON array read from byte chunks.
+
+    Elements are decoded one at a time as soon as they are complete, so the
+    remainder of the array is neither buffered nor parsed once limit is hit.
+    Raises ValueError if the body ends before the closing bracket.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    count = 0
+    for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+        while count < limit:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is incomplete, wait for the next chunk.
+                break
+            if buffer[pos] not in "{[\"" and (
+                end == len(buffer) or buffer[end] not in JSON_DELIMITERS
+            ):
+                # A number or literal is only complete once a delimiter
+                # follows it; "15." or "1e" may continue in the next chunk.
+                break
+            pos = end
+            count += 1
+            yield element
+        if count >= limit:
+            return
+    if count < limit:
+        raise ValueError("Truncated JSON array")
+
+
+def image_tag(item, image_type, parent_id=None):
+    """Return the Jellyfin tag of an item image, or of its parent's image.
+
+    Parent tags are only trusted when Jellyfin reports them for parent_id
+    itself, since for episodes they may belong to the series instead.
+    """
+    if parent_id is None:
+        if image_type == "Backdrop":
+            return next(iter(item.get("BackdropImageTags") or []), None)
+        return (item.get("ImageTags") or {}).get(image_type)
+
+    if image_type == "Backdrop":
+        if item.get("ParentBackdropItemId") != parent_id:
+            return None
+        return next(iter(item.get("ParentBackdropImageTags") or []), None)
+    if item.get(f"Parent{image_type}ItemId", item.get(f"Parent{image_type}ImageItemId")) != parent_id:
+        return None
+    return item.get(f"Parent{image_type}ImageTag")
+
+
+def image_known_missing(item, image_type):
+    """Return True if the item's own image tags show it has no such image."""
+    tags_key = "BackdropImageTags" if image_type == "Backdrop" else "ImageTags"
+    return tags_key in item and image_tag(item, image_type) is None
+
+
+class RequestScheduler:
+    """Token bucket limiter for the requests sent to one server.
+
+    Every request takes one token; tokens refill at rate per second up to
+    burst, and acquire() blocks until a token is free. A rate of 0 disables
+    limiting.
+
+    Requests are not reordered here. Home Assistant updates the sensors one
+    at a time and get_data sends its requests one after another, so the
+    order they are sent in is the order get_data makes them: metadata
+    first, then posters, then fanart, per library.
+    """
+
+    def __init__(self, rate, burst):
+        """Init."""
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        if not self.rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the wait until this request's token.
+            delay = -self._tokens / self.rate
+        if delay > 0:
+            time.sleep(delay)
+
 
 class JellyfinClient:
     """Client class"""
 
-    def __init__(self, host, api_key, ssl, port, max_items, user_id, show_episodes):
+    def __init__(self, host, api_key, ssl, port, max_items, user_id, show_episodes,
+        rate_limit=DEFAULT_RATE_LIMIT, burst=DEFAULT_BURST, image_processor=None,
+        transport=None):
         """Init."""
         self.data = {}
+        self.transport = transport or RequestsTransport()
+        self.scheduler = RequestScheduler(rate_limit, burst)
+        self.image_processor = image_processor
+        self._missing_images = {}
+        self._remote_images = {}
         self.host = host
         self.ssl = "s" if ssl else ""
         self.port = port
@@ -26,7 +181,7 @@ class JellyfinClient:
         try:
             url = f"http{self.ssl}://{self.host}:{self.port}/UserViews?userId={self.user_id}&api_key={self.api_key}"
             _LOGGER.info("Making API call on URL %s", url)
-            api = requests.get(url, timeout=10)
+            api = self._get(url)
         except OSError:
             _LOGGER.warning("Host %s is not available", self.host)
             self._state = "%s cannot be reached" % self.host
@@ -41,61 +196,164 @@ class JellyfinClient:
 
         return self.data["ViewCategories"]
 
+    def prune_expired(self):
+        """Forget missing and validated images whose TTL has run out."""
+        now = time.monotonic()
+        for key, expires in list(self._missing_images.items()):
+            if expires <= now:
+                self._missing_images.pop(key, None)
+        for url, (exists, expires) in list(self._remote_images.items()):
+            if expires <= now:
+                self._remote_images.pop(url, None)
+
     def get_data(self, categoryId):
+        self.prune_expired()
         fields = 'ParentId,ProviderIds,Overview,RemoteTrailers,CommunityRating,Studios,PremiereDate,Genres,ChildCount,ProductionYear,DateCreated'
         try:
             url = f"http{self.ssl}://{self.host}:{self.port}/Users/{self.user_id}/Items/Latest?Limit={self.max_items}&Fields={fields}&ParentId={categoryId}&api_key={self.api_key}{self.show_episodes}"
             _LOGGER.info("Making API call on URL %s", url)
-            api = requests.get(url, timeout=10)
+            api = self._get(url, stream=True)
         except OSError:
             _LOGGER.warning("Host %s is not available", self.host)
             self._state = "%s cannot be reached" % self.host
             return
 
-        if api.status_code == 200:
-            self._state = "Online"
-            category_data = api.json()[: self.max_items]
+        try:
+            if api.status_code != 200:
+                _LOGGER.info("Could not reach url %s", url)
+                self._state = "%s cannot be reached" % self.host
+                return
 
-        else:
-            _LOGGER.info("Could not reach url %s", url)
+            category_data = list(
+                iter_json_array(
+                    api.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                    int(self.max_items),
+                )
+            )
+            self._state = "Online"
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Invalid response from %s: %s", self.host, err)
             self._state = "%s cannot be reached" % self.host
             return
+        finally:
+            # Drops the rest of the body if we stopped decoding early.
+            api.close()
 
-        # load the images as local assets
-        image_types = ['Primary', 'Backdrop', 'Banner', 'Logo', 'Thumb']
-        for item in category_data:
-            if itemId := item.get('Id', None):
-                for imageType in image_types:
-                    image_url = self.get_image_url(itemId, imageType)
-                    image_bytes = self.get_image_bytes(image_url)
-                    item[f'{imageType}_bytes'] = BytesIO(image_bytes)
-            
-            if ParentId := item.get('ParentId', None):
-                for imageType in image_types:
-                    image_url = self.get_image_url(ParentId, imageType)
-                    image_bytes = self.get_image_bytes(image_url)
-                    item[f'{imageType}_parent_bytes'] = BytesIO(image_bytes)
+        # load the images as local assets, one image type at a time so that
+        # every poster is requested before any fanart
+        images = [{} for item in category_data]
+        deferred = []
+        for imageType in IMAGE_TYPES:
+            for item, item_images in zip(category_data, images):
+                if itemId := item.get('Id', None):
+                    if image_known_missing(item, imageType):
+                        item_images[imageType] = b''
+                    else:
+                        self.load_item_image(
+                            item_images, imageType, itemId, imageType,
+                            image_tag(item, imageType), deferred
+                        )
+
+                if imageType not in PARENT_IMAGE_TYPES:
+                    continue
+                if ParentId := item.get('ParentId', None):
+                    self.load_item_image(
+                        item_images, f'{imageType}_parent', ParentId, imageType,
+                        image_tag(item, imageType, ParentId), deferred
+                    )
+
+        for item_images, name, result in deferred:
+            item_images[name] = result()
+
+        base_url = self.get_base_url()
+        items = [
+            MediaItem.from_json(
+                item, base_url, item_images, self.get_fallback_images(item, item_images)
+            )
+            for item, item_images in zip(category_data, images)
+        ]
 
-        self.data[categoryId] = category_data
+        self.data[categoryId] = items
 
         return self.data[categoryId]
 
+    def close(self):
+        """Stop the image processor's worker processes, if any."""
+        if self.image_processor is not None:
+            self.image_processor.shutdown()
+
+    def load_item_image(self, item_images, name, itemId, imageType, tag, deferred):
+        """Store the card image of an item in item_images[name].
+
+        Images that are scaled locally are submitted to the image processor
+        and their result is queued on deferred, so get_data only waits for
+        them once the whole scan has been submitted.
+        """
+        key = (itemId, imageType)
+        expires = self._missing_images.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._missing_images.pop(key, None)
+            expires = None
+
+        if expires is not None:
+            item_images[name] = b''
+        elif self.image_processor is None or tag is None:
+            item_images[name] = self.get_image_bytes(
+                self.get_image_url(itemId, imageType), key
+            )
+        else:
+            fetch_source = functools.partial(
+                self.get_image_bytes,
+                self.get_source_image_url(itemId, imageType, tag),
+                key,
+            )
+            deferred.append(
+                (item_images, name, self.image_processor.submit(itemId, imageType, tag, fetch_source))
+            )
+
+    def get_fallback_images(self, item, item_images):
+        """Return validated TVDB URLs for the card images an item is missing."""
+        media_type, artwork_types = TVDB_FALLBACKS.get(item.get('Type'), (None, {}))
+        tvdb_id = (item.get('ProviderIds') or {}).get('Tvdb', '')
+        fallbacks = {}
+        for name, artwork_type in artwork_types.items():
+            if not item_images.get(name):
+                if url := self.get_tvdb_images(tvdb_id, artwork_type, media_type):
+                    fallbacks[name] = url
+        return fallbacks
+
     def get_image_url(self, itemId, imageType):
         url = f"http{self.ssl}://{self.host}:{self.port}/Items/{itemId}/Images/{imageType}?maxHeight=360&maxWidth=640&quality=90&userId={self.user_id}&api_key={self.api_key}"
         return url
+
+    def get_source_image_url(self, itemId, imageType, tag):
+        """Return the URL of the original, unscaled image for a tag."""
+        url = f"http{self.ssl}://{self.host}:{self.port}/Items/{itemId}/Images/{imageType}?tag={tag}&api_key={self.api_key}"
+        return url
             
     def get_base_url(self):
         """Return the base URL for the Jellyfin server."""
         protocol = "https" if self.ssl else "http"
         return f"{protocol}://{self.host}:{self.port}"
 
-    def get_image_bytes(self, url):
-        """Return the bytes of an image at a URL"""
-        response = requests.get(url, timeout=10)
+    def _get(self, url, **kwargs):
+        """Send a GET request once the rate limit allows it."""
+        self.scheduler.acquire()
+        return self.transport.get(url, timeout=10, **kwargs)
+
+    def get_image_bytes(self, url, missing_key=None):
+        """Return the bytes of an image at a URL
+
+        A 404 is remembered under missing_key, so the image is not requested
+        again until MISSING_IMAGE_TTL_SECONDS have passed.
+        """
+        response = self._get(url)
         if response.status_code == 200:
             return response.content
         elif response.status_code == 404:
-            _LOGGER.warning("Image not found at URL: %s", url)
+            _LOGGER.info("Image not found at URL: %s", url)
+            if missing_key is not None:
+                self._missing_images[missing_key] = time.monotonic() + MISSING_IMAGE_TTL_SECONDS
         elif response.status_code == 403:
             _LOGGER.warning("Access forbidden to image at URL: %s", url)
         else:
@@ -103,4 +361,23 @@ class JellyfinClient:
         return b''
 
     def get_tvdb_images(self, tvdbid, img_type: str, media_type: str):
-        return  f"https://artworks.thetvdb.com/banners/{media_type}/{tvdbid}/{img_type}s/{tvdbid}.jpg"
\ No newline at end of file
+        """Return a TVDB artwork URL, or None if there is no valid one.
+
+        The URL is checked with a HEAD request, and the result is cached for
+        MISSING_IMAGE_TTL_SECONDS so dashboards are never sent to a 404.
+        """
+        if not tvdbid or media_type not in TVDB_MEDIA_TYPES:
+            return None
+
+        url = f"https://artworks.thetvdb.com/banners/{media_type}/{tvdbid}/{img_type}s/{tvdbid}.jpg"
+        exists, expires = self._remote_images.get(url, (False, 0))
+        if expires <= time.monotonic():
+            try:
+                response = self.transport.head(url, timeout=10, allow_redirects=True)
+                exists = response.status_code == 200
+            except OSError:
+                _LOGGER.info("Could not validate image URL %s", url)
+                exists = False
+            self._remote_images[url] = (exists, time.monotonic() + MISSING_IMAGE_TTL_SECONDS)
+
+        return url if exists else None
\ No newline at end of file
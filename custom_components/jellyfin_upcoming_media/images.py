@@ -0,0 +1,183 @@
+"""Local image processing."""
+import glob
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+_LOGGER = logging.getLogger(__name__)
+
+PIL_AVAILABLE = Image is not None
+
+IMAGE_FORMATS = {"jpeg": "jpg", "webp": "webp"}
+DEFAULT_IMAGE_FORMAT = "jpeg"
+IMAGE_QUALITY = 85
+MAX_WORKERS = 2
+
+# Cached images not used by any scan for this long are deleted.
+CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+PRUNE_INTERVAL_SECONDS = 3600
+
+# Bounding boxes of the derived images, the same the card used to request
+# from Jellyfin. Primary images are shown as posters, the rest as fanart.
+POSTER_SIZE = (240, 360)
+FANART_SIZE = (640, 360)
+IMAGE_SIZES = {"Primary": POSTER_SIZE}
+
+
+def image_extension(image_bytes):
+    """Return the file extension matching the encoded image bytes."""
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "webp"
+    return "jpg"
+
+
+def derive_image(source, size, image_format, quality=IMAGE_QUALITY):
+    """Scale source image bytes to fit size and encode them.
+
+    Runs in a worker process, so it only takes and returns plain bytes.
+    """
+    with Image.open(BytesIO(source)) as image:
+        # Lets the JPEG decoder downscale while decoding.
+        image.draft("RGB", size)
+        image = image.convert("RGB")
+        image.thumbnail(size)
+        output = BytesIO()
+        if image_format == "webp":
+            image.save(output, "WEBP", quality=quality, method=4)
+        else:
+            image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    return output.getvalue()
+
+
+class ImageProcessor:
+    """Derive card sized images locally and keep them in a file cache.
+
+    Cached files are keyed by item, image type and Jellyfin image tag, so a
+    source image is only downloaded again once Jellyfin reports a new tag.
+    Files of older tags are removed when a new one is stored, and files no
+    scan has used for CACHE_MAX_AGE_SECONDS are pruned.
+    """
+
+    def __init__(self, cache_dir, image_format=DEFAULT_IMAGE_FORMAT, max_workers=MAX_WORKERS):
+        """Init."""
+        self.cache_dir = cache_dir
+        self.image_format = image_format
+        self.max_workers = max_workers
+        self._pool = None
+        self._last_prune = 0
+
+    def _cache_path(self, item_id, image_type, tag):
+        filename = f"{item_id}_{image_type}_{tag}.{IMAGE_FORMATS[self.image_format]}"
+        return os.path.join(self.cache_dir, filename)
+
+    def _submit(self, source, size):
+        """Start scaling an image in the worker pool, or return None if it is broken."""
+        if self._pool is None:
+            # Spawned workers do not inherit the Home Assistant process state.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        try:
+            return self._pool.submit(derive_image, source, size, self.image_format)
+        except BrokenProcessPool as err:
+            self._drop_pool(err)
+            return None
+
+    def _result(self, future, source, size):
+        """Wait for a scaled image, scaling it in place if the pool broke."""
+        if future is not None:
+            try:
+                return future.result()
+            except BrokenProcessPool as err:
+                self._drop_pool(err)
+        return derive_image(source, size, self.image_format)
+
+    def _drop_pool(self, err):
+        _LOGGER.warning("Image worker pool failed, processing in place: %s", err)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def shutdown(self):
+        """Stop the worker processes; a later submit starts new ones."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _store(self, item_id, image_type, path, derived):
+        """Write a derived image and remove the files of its older tags."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(derived)
+        os.replace(tmp_path, path)
+
+        pattern = f"{glob.escape(item_id)}_{image_type}_*"
+        for old_path in glob.glob(os.path.join(glob.escape(self.cache_dir), pattern)):
+            if old_path != path:
+                os.remove(old_path)
+
+    def prune(self):
+        """Delete cached files that no scan has used for CACHE_MAX_AGE_SECONDS."""
+        now = time.time()
+        if now - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > CACHE_MAX_AGE_SECONDS:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def submit(self, item_id, image_type, tag, fetch_source):
+        """Start producing a derived image and return a callable for its bytes.
+
+        fetch_source is only called on a cache miss. The source is handed to
+        the worker pool without waiting, so callers that submit a whole scan
+        before calling any of the results get the workers scaling in
+        parallel while the remaining sources are still downloading.
+        """
+        self.prune()
+
+        path = self._cache_path(item_id, image_type, tag)
+        try:
+            with open(path, "rb") as cached:
+                data = cached.read()
+            # Marks the file as used for prune().
+            os.utime(path)
+            return lambda: data
+        except FileNotFoundError:
+            pass
+
+        source = fetch_source()
+        if not source:
+            return lambda: b""
+        size = IMAGE_SIZES.get(image_type, FANART_SIZE)
+        future = self._submit(source, size)
+
+        def result():
+            try:
+                derived = self._result(future, source, size)
+            except Exception as err:
+                _LOGGER.error("Failed to process image %s of item %s: %s", image_type, item_id, err)
+                return b""
+            self._store(item_id, image_type, path, derived)
+            return derived
+
+        return result
@@ -0,0 +1,118 @@
+"""Media item model."""
+from dataclasses import dataclass
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple, Union
+
+import dateutil.parser
+
+NO_IMAGES = MappingProxyType({})
+NO_FALLBACKS = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class MediaItem:
+    """Immutable Jellyfin Latest item with the card fields precomputed."""
+
+    id: str
+    type: str
+    name: str
+    series_name: str
+    parent_id: str
+    premiere_date: str
+    date_created: str
+    airdate: str
+    production_year: Optional[int]
+    child_count: Optional[int]
+    season: Optional[int]
+    runtime: Union[int, str]
+    number: str
+    release: str
+    rating: str
+    official_rating: str
+    genres: Tuple[str, ...]
+    studio: str
+    artists: str
+    trailer: str
+    overview: str
+    tvdb_id: str
+    deep_link: str
+    images: Mapping[str, bytes]
+    fallback_images: Mapping[str, str]
+
+    @classmethod
+    def from_json(cls, item, base_url, images=NO_IMAGES, fallback_images=NO_FALLBACKS):
+        """Build an item from a Jellyfin BaseItemDto dict.
+
+        fallback_images maps image types the item is missing to external
+        artwork URLs that were already validated.
+        """
+        item_id = item.get("Id", "")
+
+        if "RunTimeTicks" in item:
+            timeobject = timedelta(microseconds=item["RunTimeTicks"] / 10)
+            runtime = int(timeobject.total_seconds() / 60)
+        else:
+            runtime = ""
+
+        if "ParentIndexNumber" in item and "IndexNumber" in item:
+            number = "S{:02d}E{:02d}".format(
+                item["ParentIndexNumber"], item["IndexNumber"]
+            )
+        else:
+            number = ""
+
+        if "PremiereDate" in item:
+            date = dateutil.parser.isoparse(item["PremiereDate"])
+            release = f"Released {date.date()}"
+        else:
+            release = ""
+
+        if item.get("CommunityRating") is not None:
+            rating = "{} {:.1f}".format(
+                "\u2605",  # Star character
+                item["CommunityRating"],
+            )
+        else:
+            rating = ""
+
+        studios = item.get("Studios") or [{}]
+        trailers = item.get("RemoteTrailers") or [{}]
+
+        return cls(
+            id=item_id,
+            type=item.get("Type", ""),
+            name=item.get("Name", ""),
+            series_name=item.get("SeriesName", ""),
+            parent_id=item.get("ParentId", ""),
+            premiere_date=item.get("PremiereDate", ""),
+            date_created=item.get("DateCreated", ""),
+            # Falls back to the date added so unreleased items keep a
+            # stable airdate between scans.
+            airdate=item.get("PremiereDate") or item.get("DateCreated", ""),
+            production_year=item.get("ProductionYear"),
+            child_count=item.get("ChildCount"),
+            season=item.get("ParentIndexNumber"),
+            runtime=runtime,
+            number=number,
+            release=release,
+            rating=rating,
+            official_rating=item.get("OfficialRating", ""),
+            genres=tuple(item.get("Genres", ())),
+            studio=studios[0].get("Name", ""),
+            artists=", ".join(item.get("Artists", [])[:3]),
+            trailer=trailers[0].get("Url", ""),
+            overview=item.get("Overview", ""),
+            tvdb_id=(item.get("ProviderIds") or {}).get("Tvdb", ""),
+            deep_link=f"{base_url}/web/index.html#!/details?id={item_id}",
+            images=MappingProxyType(dict(images)),
+            fallback_images=MappingProxyType(dict(fallback_images)),
+        )
+
+    def image(self, image_type):
+        """Return the stored bytes for an image type, or b'' if missing."""
+        return self.images.get(image_type, b"")
+
+    def fallback_image(self, image_type):
+        """Return the validated fallback URL for an image type, or ""."""
+        return self.fallback_images.get(image_type, "")
@@ -8,13 +8,12 @@ https://github.com/custom-cards/upcoming-media-card
 
 """
 import os
+import hashlib
 import logging
 import json
 import time
 import re
-from io import BytesIO
 import requests
-import dateutil.parser
 from datetime import date, datetime
 from datetime import timedelta
 import voluptuous as vol
@@ -22,16 +21,30 @@ from itertools import groupby
 import homeassistant.helpers.config_validation as cv
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.components import sensor
-from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_PORT, CONF_SSL
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SSL,
+    EVENT_HOMEASSISTANT_STOP,
+)
 from homeassistant.helpers.entity import Entity
 
-from .client import JellyfinClient
+from .client import DEFAULT_BURST, DEFAULT_RATE_LIMIT, JellyfinClient
+from .images import (
+    DEFAULT_IMAGE_FORMAT,
+    IMAGE_FORMATS,
+    PIL_AVAILABLE,
+    ImageProcessor,
+    image_extension,
+)
 
 __version__ = "0.0.2"
 
 DOMAIN = "jellyfin_upcoming_media"
 DOMAIN_DATA = f"{DOMAIN}_data"
 ATTRIBUTION = "Data is provided by Jellyfin."
+IMAGE_URL_PATH = f"/local/community/{DOMAIN}"
 
 DICT_LIBRARY_TYPES = {"tvshows": "TV Shows", "movies": "Movies", "music": "Music"}
 
@@ -45,6 +58,10 @@ CONF_USER_ID = "user_id"
 CONF_USE_BACKDROP = "use_backdrop"
 CONF_GROUP_LIBRARIES = "group_libraries"
 CONF_EPISODES = "episodes"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
+CONF_PROCESS_IMAGES = "process_images"
+CONF_IMAGE_FORMAT = "image_format"
 
 CATEGORY_NAME = "CategoryName"
 CATEGORY_ID = "CategoryId"
@@ -107,7 +124,15 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(CONF_MAX, default=5): cv.Number,
         vol.Optional(CONF_USE_BACKDROP, default=False): cv.boolean,
         vol.Optional(CONF_GROUP_LIBRARIES, default=False): cv.boolean,
-        vol.Optional(CONF_EPISODES, default=True): cv.boolean
+        vol.Optional(CONF_EPISODES, default=True): cv.boolean,
+        vol.Optional(CONF_RATE_LIMIT, default=DEFAULT_RATE_LIMIT): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_RATE_LIMIT_BURST, default=DEFAULT_BURST): cv.positive_int,
+        vol.Optional(CONF_PROCESS_IMAGES, default=False): cv.boolean,
+        vol.Optional(CONF_IMAGE_FORMAT, default=DEFAULT_IMAGE_FORMAT): vol.In(
+            list(IMAGE_FORMATS)
+        ),
     }
 )
 
@@ -117,6 +142,17 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
     # Create DATA dict
     hass.data[DOMAIN_DATA] = {}
 
+    # Configure the client.
+    client = create_client(hass, config)
+    hass.data[DOMAIN_DATA]["client"] = client
+    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, lambda event: client.close())
+
+    add_devices(create_sensors(hass, config, client), True)
+
+
+def create_client(hass, config, transport=None):
+    """Return a JellyfinClient for the platform configuration."""
+
     # Get "global" configuration.
     api_key = config.get(CONF_API_KEY)
     host = config.get(CONF_HOST)
@@ -124,12 +160,27 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
     port = config.get(CONF_PORT)
     max_items = config.get(CONF_MAX)
     user_id = config.get(CONF_USER_ID)
-    include = config.get(CONF_INCLUDE)
     show_episodes = config.get(CONF_EPISODES)
+    rate_limit = config.get(CONF_RATE_LIMIT)
+    burst = config.get(CONF_RATE_LIMIT_BURST)
+
+    image_processor = None
+    if config.get(CONF_PROCESS_IMAGES):
+        if PIL_AVAILABLE:
+            image_processor = ImageProcessor(
+                hass.config.path("www", "community", DOMAIN, "cache"),
+                config.get(CONF_IMAGE_FORMAT),
+            )
+        else:
+            _LOGGER.warning("Pillow is not installed, %s is ignored", CONF_PROCESS_IMAGES)
 
-    # Configure the client.
-    client = JellyfinClient(host, api_key, ssl, port, max_items, user_id, show_episodes)
-    hass.data[DOMAIN_DATA]["client"] = client
+    return JellyfinClient(host, api_key, ssl, port, max_items, user_id, show_episodes,
+        rate_limit, burst, image_processor, transport)
+
+
+def create_sensors(hass, config, client):
+    """Discover the libraries and return one sensor per (grouped) library."""
+    include = config.get(CONF_INCLUDE)
 
     categories = client.get_view_categories()
     
@@ -142,15 +193,13 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
         l=[list(y) for x,y in groupby(sorted(list(categories),key=lambda x: (x['CollectionType'])),lambda x: (x['CollectionType']))]
         categories = [{k:(v if k!='Id' else list(set([x['Id'] for x in i]))) for k,v in i[0].items()} for i in l]
 
-    mapped = map(
+    return map(
         lambda cat: JellyfinUpcomingMediaSensor(
             hass, {**config, CATEGORY_NAME: cat["Name"], CATEGORY_ID: cat["Id"], CATEGORY_TYPE: DICT_LIBRARY_TYPES[cat["CollectionType"]]}
         ),
         categories,
     )
 
-    add_devices(mapped, True)
-
 
 SCAN_INTERVAL = timedelta(seconds=SCAN_INTERVAL_SECONDS)
 
@@ -170,6 +219,9 @@ class JellyfinUpcomingMediaSensor(Entity):
             ).lower()  # remove special characters
         )
         self.base_dir = hass.config.config_dir
+        self._attributes = {}
+        self._fingerprint = None
+        self._pending_images = {}
 
     @property
     def name(self):
@@ -179,11 +231,6 @@ class JellyfinUpcomingMediaSensor(Entity):
     def state(self):
         return self._state
 
-    def _create_deep_link(self, item_id):
-        """Create a deep link to the Jellyfin item."""
-        base_url = self._client.get_base_url()
-        return f"{base_url}/web/index.html#!/details?id={item_id}"
-
     def handle_tv_episodes(self):
         """Return the state attributes."""
 
@@ -196,37 +243,22 @@ class JellyfinUpcomingMediaSensor(Entity):
         for show in self.data:
 
             card_item = {}
-            card_item["title"] = show.get("SeriesName",show.get("Name",""))
-            card_item['episode'] = show.get('Name', '') if show.get("SeriesName") else ""
+            card_item["title"] = show.series_name or show.name
+            card_item['episode'] = show.name if show.series_name else ""
 
-            card_item["airdate"] = show.get("PremiereDate", datetime.now().isoformat())
+            card_item["airdate"] = show.airdate
+            card_item["release"] = show.release
+            card_item["runtime"] = show.runtime
 
-            if "PremiereDate" in show:
-                date = dateutil.parser.isoparse(show.get("PremiereDate", ""))
-                card_item["release"] = f"Released {date.date()}"
+            if show.number:
+                card_item["number"] = show.number
+            elif show.season is not None:
+                card_item["number"] = "Season {:d} Special".format(show.season)
 
-            else:
-                card_item["release"] = ""
-
-            if "RunTimeTicks" in show:
-                timeobject = timedelta(microseconds=show["RunTimeTicks"] / 10)
-                card_item["runtime"] = int(timeobject.total_seconds() / 60)
-            else:
-                card_item["runtime"] = ""
-
-            if "ParentIndexNumber" and "IndexNumber" in show:
-                card_item["number"] = "S{:02d}E{:02d}".format(
-                    show["ParentIndexNumber"], show["IndexNumber"]
-                )
-            elif "ParentIndexNumber" in show and "IndexNumber" not in show:
-                card_item["number"] = "Season {:d} Special".format(
-                    show["ParentIndexNumber"]
-                )
             card_item["poster"] = self.get_local_image_or_remote(show,
                 "Primary_parent", 
                 "poster", 
                 "episode", 
-                "poster", 
                 len(card_json)
             )
 
@@ -234,17 +266,12 @@ class JellyfinUpcomingMediaSensor(Entity):
                 "Primary", 
                 "poster", 
                 "episode", 
-                "poster", 
                 len(card_json)
             )
             
-            card_item['deep_link']=self._create_deep_link(show["Id"])
-
-            trailers = show.get("RemoteTrailers", [])
-            if len(trailers)==0:
-                trailers.append({})
-            card_item['trailer']=trailers[0].get("Url", '')
-            card_item['summary']=show.get("Overview", '')
+            card_item['deep_link'] = show.deep_link
+            card_item['trailer'] = show.trailer
+            card_item['summary'] = show.overview
             card_json.append(card_item)
 
         attributes["data"] = card_json
@@ -264,47 +291,32 @@ class JellyfinUpcomingMediaSensor(Entity):
         for show in self.data:
 
             card_item = {}
-            card_item["title"] = show["Name"]
-            card_item["airdate"] = show.get("PremiereDate", datetime.now().isoformat())
+            card_item["title"] = show.name
+            card_item["airdate"] = show.airdate
 
-            if "PremiereDate" in show:
-                date = dateutil.parser.isoparse(show.get("PremiereDate", ""))
-                card_item["release"] = f"Released {date.date()}"
-
-            if show["ChildCount"] > 1:
-                card_item['number'] = "{0} seasons".format(
-                    show["ChildCount"]
-                )
-            else:
-                card_item['number'] = "{0} season".format(
-                    show["ChildCount"]
-                )
+            if show.release:
+                card_item["release"] = show.release
 
-            if "RunTimeTicks" in show:
-                timeobject = timedelta(microseconds=show["RunTimeTicks"] / 10)
-                card_item["runtime"] = int(timeobject.total_seconds() / 60)
-            else:
-                card_item["runtime"] = ""
+            if show.number:
+                card_item["number"] = show.number
+            elif show.child_count is not None:
+                if show.child_count > 1:
+                    card_item['number'] = "{0} seasons".format(show.child_count)
+                else:
+                    card_item['number'] = "{0} season".format(show.child_count)
 
-            if "Genres" in show:
-                card_item["genres"] = show["Genres"]
+            card_item["runtime"] = show.runtime
 
-            if "ParentIndexNumber" and "IndexNumber" in show:
-                card_item["number"] = "S{:02d}E{:02d}".format(
-                    show["ParentIndexNumber"], show["IndexNumber"]
-                )
+            if show.genres:
+                card_item["genres"] = show.genres
 
-            if "CommunityRating" in show:
-                card_item["rating"] = "{} {:.1f}".format(
-                    "\u2605", # Star character
-                    show.get("CommunityRating", ''),
-                )
+            if show.rating:
+                card_item["rating"] = show.rating
 
             card_item["poster"] = self.get_local_image_or_remote(show,
                 "Primary", 
                 "poster", 
                 "show", 
-                "poster", 
                 len(card_json)
             )
 
@@ -312,18 +324,12 @@ class JellyfinUpcomingMediaSensor(Entity):
                 "Backdrop", 
                 "fanart", 
                 "show", 
-                "background", 
                 len(card_json)
             )
 
-
-            card_item['deep_link']=self._create_deep_link(show["Id"])
-
-            trailers = show.get("RemoteTrailers", [])
-            if len(trailers)==0:
-                trailers.append({})
-            card_item['trailer']=trailers[0].get("Url", '')
-            card_item['summary']=show.get("Overview", '')
+            card_item['deep_link'] = show.deep_link
+            card_item['trailer'] = show.trailer
+            card_item['summary'] = show.overview
             card_json.append(card_item)
 
         attributes["data"] = card_json
@@ -343,36 +349,27 @@ class JellyfinUpcomingMediaSensor(Entity):
         for show in self.data:
 
             card_item = {}
-            card_item["title"] = show["Name"]
-            card_item["airdate"] = show.get("PremiereDate", datetime.now().isoformat())
+            card_item["title"] = show.name
+            card_item["airdate"] = show.airdate
 
-            if "PremiereDate" in show:
-                date = dateutil.parser.isoparse(show.get("PremiereDate", ""))
-                card_item["release"] = f"Released {date.date()}"
+            if show.release:
+                card_item["release"] = show.release
 
-            if "RunTimeTicks" in show:
-                timeobject = timedelta(microseconds=show["RunTimeTicks"] / 10)
-                card_item["runtime"] = int(timeobject.total_seconds() / 60)
-            else:
-                card_item["runtime"] = ""
+            card_item["runtime"] = show.runtime
 
-            if "Genres" in show:
-                card_item["genres"] = show["Genres"]
+            if show.genres:
+                card_item["genres"] = show.genres
 
-            if "Studios" in show and len(show["Studios"]) > 0:
-                card_item["studio"] = show["Studios"][0]["Name"]
+            if show.studio:
+                card_item["studio"] = show.studio
 
-            if "CommunityRating" in show:
-                card_item["rating"] = "{} {:.1f}".format(
-                    "\u2605", # Star character
-                    show.get("CommunityRating", ''),
-                )
+            if show.rating:
+                card_item["rating"] = show.rating
             
             card_item["poster"] = self.get_local_image_or_remote(show,
                 "Primary", 
                 "poster", 
                 "movie", 
-                "poster", 
                 len(card_json)
             )
 
@@ -380,17 +377,12 @@ class JellyfinUpcomingMediaSensor(Entity):
                 "Backdrop", 
                 "fanart", 
                 "movie", 
-                "background", 
                 len(card_json)
             )
 
-            card_item['deep_link']=self._create_deep_link(show["Id"])
-
-            trailers = show.get("RemoteTrailers", [])
-            if len(trailers)==0:
-                trailers.append({})
-            card_item['trailer']=trailers[0].get("Url", '')
-            card_item['summary']=show.get("Overview", '')
+            card_item['deep_link'] = show.deep_link
+            card_item['trailer'] = show.trailer
+            card_item['summary'] = show.overview
             card_json.append(card_item)
 
         attributes["data"] = card_json
@@ -410,41 +402,31 @@ class JellyfinUpcomingMediaSensor(Entity):
         for show in self.data:
 
             card_item = {}
-            card_item["title"] = show["Name"]
-            card_item["airdate"] = show.get("PremiereDate", datetime.now().isoformat())
+            card_item["title"] = show.name
+            card_item["airdate"] = show.airdate
 
-            if "Artists" in show and len(show["Artists"]) > 0:
-                card_item["studio"] = ", ".join(show["Artists"][:3])
+            if show.artists:
+                card_item["studio"] = show.artists
 
-            if "RunTimeTicks" in show:
-                timeobject = timedelta(microseconds=show["RunTimeTicks"] / 10)
-                card_item["runtime"] = int(timeobject.total_seconds() / 60)
-            else:
-                card_item["runtime"] = ""
+            card_item["runtime"] = show.runtime
 
-            if "Genres" in show:
-                card_item["genres"] = show["Genres"]
+            if show.genres:
+                card_item["genres"] = show.genres
 
-            card_item["release"] = f'Released: {show.get("ProductionYear", "")}'
+            card_item["release"] = f'Released: {show.production_year or ""}'
             
-            if "ParentIndexNumber" in show and "IndexNumber" in show:
-                card_item["number"] = "S{:02d}E{:02d}".format(
-                    show["ParentIndexNumber"], show["IndexNumber"]
-                )
+            if show.number:
+                card_item["number"] = show.number
             else:
-                card_item["number"] = show.get("ProductionYear", "")
+                card_item["number"] = show.production_year or ""
 
-            if "CommunityRating" in show:
-                card_item["rating"] = "{} {:.1f}".format(
-                    "\u2605", # Star character
-                    show.get("CommunityRating", ''),
-                )
+            if show.rating:
+                card_item["rating"] = show.rating
 
             card_item["poster"] = self.get_local_image_or_remote(show,
                 "Primary", 
                 "poster", 
                 "music", 
-                "poster", 
                 len(card_json)
             )
 
@@ -452,17 +434,12 @@ class JellyfinUpcomingMediaSensor(Entity):
                 "Backdrop", 
                 "fanart", 
                 "music", 
-                "background", 
                 len(card_json)
             )
 
-            card_item['deep_link']=self._create_deep_link(show["Id"])
-            
-            trailers = show.get("RemoteTrailers", [])
-            if len(trailers)==0:
-                trailers.append({})
-            card_item['trailer']=trailers[0].get("Url", '')
-            card_item['summary']=show.get("Overview", '')
+            card_item['deep_link'] = show.deep_link
+            card_item['trailer'] = show.trailer
+            card_item['summary'] = show.overview
             card_json.append(card_item)
 
         attributes["data"] = card_json
@@ -472,7 +449,11 @@ class JellyfinUpcomingMediaSensor(Entity):
 
     @property
     def extra_state_attributes(self):
-        """Return the state attributes."""
+        """Return the state attributes rendered by the last update."""
+        return self._attributes
+
+    def render_attributes(self):
+        """Render the card attributes for the current data."""
 
         attributes = {}
         default = OTHER_DEFAULT
@@ -480,13 +461,13 @@ class JellyfinUpcomingMediaSensor(Entity):
 
         if len(self.data) == 0:
             return attributes
-        elif self.data[0]["Type"] == "Episode":
+        elif self.data[0].type == "Episode":
             return self.handle_tv_episodes()
-        elif self.data[0]["Type"] == "Series":
+        elif self.data[0].type == "Series":
             return self.handle_tv_show()
-        elif self.data[0]["Type"] == "Movie":
+        elif self.data[0].type == "Movie":
             return self.handle_movie()
-        elif self.data[0]["Type"] == "MusicAlbum" or "Audio":
+        elif self.data[0].type == "MusicAlbum" or "Audio":
             return self.handle_music()
         else:
             card_json.append(default)
@@ -495,42 +476,31 @@ class JellyfinUpcomingMediaSensor(Entity):
             for show in self.data:
 
                 card_item = {}
-                card_item["title"] = show["Name"]
-                card_item["airdate"] = show.get("PremiereDate", datetime.now().isoformat())
+                card_item["title"] = show.name
+                card_item["airdate"] = show.airdate
 
-                card_item["episode"] = show.get("OfficialRating", "")
-                card_item["officialrating"] = show.get("OfficialRating", "")
+                card_item["episode"] = show.official_rating
+                card_item["officialrating"] = show.official_rating
 
-                if "Genres" in show:
-                    card_item["genres"] = show["Genres"]
+                if show.genres:
+                    card_item["genres"] = show.genres
 
-                if "RunTimeTicks" in show:
-                    timeobject = timedelta(microseconds=show["RunTimeTicks"] / 10)
-                    card_item["runtime"] = int(timeobject.total_seconds() / 60)
-                else:
-                    card_item["runtime"] = ""
+                card_item["runtime"] = show.runtime
 
-                if "Artists" in show and len(show["Artists"]) > 0:
-                    card_item["studio"] = ", ".join(show["Artists"][:3])
+                if show.artists:
+                    card_item["studio"] = show.artists
 
-                if "ParentIndexNumber" in show and "IndexNumber" in show:
-                    card_item["number"] = "S{:02d}E{:02d}".format(
-                        show["ParentIndexNumber"], show["IndexNumber"]
-                    )
+                if show.number:
+                    card_item["number"] = show.number
                 else:
-                    card_item["number"] = show.get("ProductionYear", "")
+                    card_item["number"] = show.production_year or ""
 
-
-                card_item["rating"] = "%s %s" % (
-                    "\u2605",  # Star character
-                    show.get("CommunityRating", ""),
-                )
+                card_item["rating"] = show.rating
 
                 card_item["poster"] = self.get_local_image_or_remote(show,
                     "Primary", 
                     "poster", 
                     "other", 
-                    "poster", 
                     len(card_json)
                 )
 
@@ -538,17 +508,12 @@ class JellyfinUpcomingMediaSensor(Entity):
                     "Backdrop", 
                     "fanart", 
                     "other", 
-                    "background", 
                     len(card_json)
                 )
 
-                card_item['deep_link']=self._create_deep_link(show["Id"])
-
-                trailers = show.get("RemoteTrailers", [])
-                if len(trailers)==0:
-                    trailers.append({})
-                card_item['trailer']=trailers[0].get("Url", '')
-                card_item['summary']=show.get("Overview", '')
+                card_item['deep_link'] = show.deep_link
+                card_item['trailer'] = show.trailer
+                card_item['summary'] = show.overview
                 card_json.append(card_item) 
 
             attributes["data"] = card_json
@@ -557,6 +522,10 @@ class JellyfinUpcomingMediaSensor(Entity):
         return attributes
 
     def update(self):
+        self.set_data(self.fetch_data())
+
+    def fetch_data(self):
+        """Return the latest items of the library, or None on error."""
         if isinstance(self.category_id, str): 
             data = self._client.get_data(self.category_id)
         else:
@@ -564,14 +533,53 @@ class JellyfinUpcomingMediaSensor(Entity):
             for element in self.category_id:
                 for res in self._client.get_data(element):
                     data.append(res)
-            data.sort(key=lambda item:item['DateCreated'], reverse=True) #as we added all libraries we now resort to get the newest at top
+            data.sort(key=lambda item:item.date_created, reverse=True) #as we added all libraries we now resort to get the newest at top
 
-        if data is not None:
-            self._state = "Online"
-            self.data = data
-        else:
+        return data
+
+    def set_data(self, data):
+        """Update the state from fetched items and re-render the card.
+
+        Returns True if the card attributes changed.
+        """
+        if data is None:
             self._state = "error"
             _LOGGER.error("ERROR")
+            return False
+
+        self._state = "Online"
+        self.data = data
+        return self.refresh_attributes()
+
+    def refresh_attributes(self):
+        """Render the card and only publish it if it changed since last time.
+
+        The fingerprint covers the rendered card list and the bytes of every
+        image it references, so an identical scan writes no image files and
+        hands Home Assistant the very same attribute dict as before, which
+        the state machine discards without a state_changed event.
+        """
+        self._pending_images = {}
+        attributes = self.render_attributes()
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps(attributes, sort_keys=True).encode())
+        for filename, image_bytes in sorted(self._pending_images.items()):
+            digest.update(filename.encode())
+            digest.update(hashlib.blake2b(image_bytes, digest_size=16).digest())
+        fingerprint = digest.hexdigest()
+
+        if fingerprint == self._fingerprint:
+            _LOGGER.debug("No changes for %s, skipping update", self.entity_id)
+            self._pending_images = {}
+            return False
+
+        for filename, image_bytes in self._pending_images.items():
+            self.store_image_bytes(image_bytes, filename)
+        self._pending_images = {}
+        self._attributes = attributes
+        self._fingerprint = fingerprint
+        return True
 
     def store_image_bytes(self, image_bytes: bytes, filename: str):
         """Store image bytes in the www/community folder."""
@@ -593,27 +601,24 @@ class JellyfinUpcomingMediaSensor(Entity):
             _LOGGER.info(f"Image saved successfully to {file_path}")
             
             # Return the URL path for accessing the image
-            return f"/local/community/jellyfin_upcoming_media/{filename}"
+            return f"{IMAGE_URL_PATH}/{filename}"
             
         except Exception as e:
             _LOGGER.error(f"Failed to save image to {file_path}: {e}")
             return None
     
     def get_local_image_or_remote(self, show, jellyfin_image_type:str, upcoming_image_type:str, library_type:str, 
-        tvdb_image_type:str, sequence_number:int) -> str:
-        """
+        sequence_number:int) -> str:
+        """Queue the item image for storage and return its URL.
+
+        Files are only written by refresh_attributes once the rendered card
+        is known to have changed. Items without the image fall back to the
+        TVDB artwork the client validated while fetching, otherwise to "".
         """
-        if (img_bytes:= show.get(f"{jellyfin_image_type}_bytes", BytesIO(b'')).read()) != b'':
-            return self.store_image_bytes(
-                img_bytes, 
-                f'{upcoming_image_type}_{library_type}_{sequence_number}.{"jpg"}'
-            )+f"?id={show.get('Id')}"
-        else:
-            self.store_image_bytes(
-                b'', 
-                f'{upcoming_image_type}_{library_type}_{sequence_number}.{"jpg"}'
-            )
-            return self.hass.data[DOMAIN_DATA]["client"].get_tvdb_images(
-                show.get("ProviderIds", {}).get('Tvdb',''), tvdb_image_type, library_type
-            )
+        img_bytes = show.image(jellyfin_image_type)
+        filename = f'{upcoming_image_type}_{library_type}_{sequence_number}.{image_extension(img_bytes)}'
+        if img_bytes != b'':
+            self._pending_images[filename] = img_bytes
+            return f"{IMAGE_URL_PATH}/{filename}?id={show.id}"
 
+        return show.fallback_image(jellyfin_image_type)
@@ -0,0 +1,148 @@
+"""HTTP transports for the Jellyfin client."""
+import json
+import logging
+import re
+import threading
+import time
+import zipfile
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+_LOGGER = logging.getLogger(__name__)
+
+# Query parameters and path segments that identify the account rather than
+# the request; they are left out of fixture keys so nothing secret is
+# recorded and a fixture can be replayed with any credentials.
+REDACTED_PARAMS = ("api_key", "userId")
+USER_PATH = re.compile(r"/Users/[^/]+/")
+
+FIXTURE_INDEX = "index.json"
+FIXTURE_OPTIONS = "options.json"
+
+
+def fixture_key(method, url):
+    """Return the archive key of a request, without host or credentials."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in REDACTED_PARAMS]
+    path = USER_PATH.sub("/Users/-/", parts.path)
+    return f"{method} {path}?{urlencode(query)}"
+
+
+class FixtureResponse:
+    """Minimal stand-in for requests.Response backed by recorded bytes."""
+
+    def __init__(self, status_code, content):
+        """Init."""
+        self.status_code = status_code
+        self.content = content
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+class RequestsTransport:
+    """Send requests to the network with requests."""
+
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return requests.head(url, **kwargs)
+
+
+class RecordingTransport:
+    """Pass requests through to another transport and record the responses.
+
+    Call save() to write everything recorded so far to a zip archive. The
+    options the scan ran with are stored alongside, so a replay can tell
+    when it asks for different requests.
+    """
+
+    def __init__(self, path, transport=None, options=None):
+        """Init."""
+        self.path = path
+        self.transport = transport or RequestsTransport()
+        self.options = options or {}
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def _record(self, method, url, response):
+        content = b"" if method == "HEAD" else response.content
+        response.close()
+        with self._lock:
+            self._responses[fixture_key(method, url)] = (response.status_code, content)
+        return FixtureResponse(response.status_code, content)
+
+    def get(self, url, **kwargs):
+        return self._record("GET", url, self.transport.get(url, **kwargs))
+
+    def head(self, url, **kwargs):
+        return self._record("HEAD", url, self.transport.head(url, **kwargs))
+
+    def save(self):
+        """Write the recorded responses to the fixture archive."""
+        with self._lock:
+            responses = dict(self._responses)
+
+        index = {}
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for number, (key, (status_code, content)) in enumerate(sorted(responses.items())):
+                body = f"bodies/{number}"
+                archive.writestr(body, content)
+                index[key] = {"status": status_code, "body": body}
+            archive.writestr(FIXTURE_INDEX, json.dumps(index, indent=1))
+            archive.writestr(FIXTURE_OPTIONS, json.dumps(self.options, indent=1))
+        _LOGGER.info("Recorded %d responses to %s", len(index), self.path)
+
+
+class ReplayTransport:
+    """Answer requests from a fixture archive, optionally with added latency.
+
+    Requests that were not recorded get a 404 response. If options are
+    given, a warning is logged for each one the fixture was recorded with
+    a different value of, since those change the requests that are made.
+    """
+
+    def __init__(self, path, latency=0.0, options=None):
+        """Init."""
+        self.path = path
+        self.latency = latency
+        self._responses = {}
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read(FIXTURE_INDEX))
+            for key, entry in index.items():
+                self._responses[key] = (entry["status"], archive.read(entry["body"]))
+            if FIXTURE_OPTIONS in archive.namelist():
+                self.options = json.loads(archive.read(FIXTURE_OPTIONS))
+            else:
+                self.options = {}
+
+        for name, value in (options or {}).items():
+            if name in self.options and self.options[name] != value:
+                _LOGGER.warning(
+                    "Fixture %s was recorded with %s=%r but is replayed with %s=%r",
+                    path, name, self.options[name], name, value,
+                )
+
+    def _replay(self, method, url):
+        if self.latency:
+            time.sleep(self.latency)
+        key = fixture_key(method, url)
+        if key not in self._responses:
+            _LOGGER.warning("No recorded response in %s for %s", self.path, key)
+            return FixtureResponse(404, b"")
+        return FixtureResponse(*self._responses[key])
+
+    def get(self, url, **kwargs):
+        return self._replay("GET", url)
+
+    def head(self, url, **kwargs):
+        return self._replay("HEAD", url)
@@ -0,0 +1,188 @@
+"""JellyfinClient behaviour against a replayed scan."""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from custom_components.jellyfin_upcoming_media.client import JellyfinClient, RequestScheduler
+from custom_components.jellyfin_upcoming_media.images import ImageProcessor
+from custom_components.jellyfin_upcoming_media.transport import ReplayTransport, fixture_key
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "jellyfin_latest.zip")
+MOVIES_ID = "f137a2dd21bbc1b99aa5c0f6bf02a805"
+SHOWS_ID = "a656b907eb3a73532e40e44b968d0225"
+
+
+class LoggingTransport(ReplayTransport):
+    """Replay the fixture and remember the key of every request made."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def _replay(self, method, url):
+        self.requests.append(fixture_key(method, url))
+        return super()._replay(method, url)
+
+
+def make_client(transport, image_processor=None):
+    return JellyfinClient(
+        "localhost", "key", False, 8096, 5, "user", True,
+        rate_limit=0, image_processor=image_processor, transport=transport,
+    )
+
+
+def requested_image_types(transport):
+    return {key.split("/Images/")[1].split("?")[0] for key in transport.requests if "/Images/" in key}
+
+
+def test_only_card_images_are_fetched():
+    transport = LoggingTransport(FIXTURE)
+    items = make_client(transport).get_data(SHOWS_ID) + make_client(transport).get_data(MOVIES_ID)
+
+    assert requested_image_types(transport) == {"Primary", "Backdrop"}
+    assert all(set(item.images) <= {"Primary", "Primary_parent", "Backdrop"} for item in items)
+
+
+def test_only_card_images_are_processed(tmp_path):
+    transport = LoggingTransport(FIXTURE)
+    processor = ImageProcessor(str(tmp_path))
+    client = make_client(transport, processor)
+    client.get_data(SHOWS_ID)
+    client.get_data(MOVIES_ID)
+    client.close()
+
+    assert requested_image_types(transport) == {"Primary", "Backdrop"}
+    assert processor._pool is None
+
+
+def test_image_processor_shutdown(tmp_path):
+    pytest.importorskip("PIL")
+    from io import BytesIO
+    from PIL import Image
+
+    source = BytesIO()
+    Image.new("RGB", (1000, 1500), "red").save(source, "JPEG")
+    processor = ImageProcessor(str(tmp_path))
+    result = processor.submit("item", "Primary", "tag", lambda: source.getvalue())
+
+    with Image.open(BytesIO(result())) as derived:
+        assert derived.size == (240, 360)
+    processor.shutdown()
+    assert processor._pool is None
+
+
+def test_missing_images_are_not_requested_again_within_ttl():
+    transport = LoggingTransport(FIXTURE)
+    client = make_client(transport)
+    missing = fixture_key("GET", client.get_image_url(MOVIES_ID, "Primary"))
+
+    client.get_data(MOVIES_ID)
+    assert transport.requests.count(missing) == 1
+    assert (MOVIES_ID, "Primary") in client._missing_images
+
+    client.get_data(MOVIES_ID)
+    assert transport.requests.count(missing) == 1
+
+    # Once the TTL has run out the image is asked for again.
+    client._missing_images[(MOVIES_ID, "Primary")] = time.monotonic() - 1
+    client.get_data(MOVIES_ID)
+    assert transport.requests.count(missing) == 2
+
+
+def test_images_known_missing_from_tags_are_not_requested():
+    transport = LoggingTransport(FIXTURE)
+    sintel = make_client(transport).get_data(MOVIES_ID)[1]
+
+    assert sintel.image("Backdrop") == b""
+    assert not any(key.startswith(f"GET /Items/{sintel.id}/Images/Backdrop") for key in transport.requests)
+
+
+def with_tvdb_id(transport, item_id, tvdb_id):
+    """Give an item of the recorded movies library a TVDB id."""
+    latest = next(key for key in transport._responses if f"ParentId={MOVIES_ID}" in key)
+    status, body = transport._responses[latest]
+    items = json.loads(body)
+    for item in items:
+        if item["Id"] == item_id:
+            item["ProviderIds"] = {"Tvdb": tvdb_id}
+    transport._responses[latest] = (status, json.dumps(items).encode())
+
+
+def test_tvdb_fallback_is_validated_while_fetching():
+    transport = LoggingTransport(FIXTURE)
+    with_tvdb_id(transport, "8d2e4c6a1b3f4e5d9c7b6a5f4e3d2c1b", "12345")
+    url = "https://artworks.thetvdb.com/banners/movie/12345/backgrounds/12345.jpg"
+    transport._responses[fixture_key("HEAD", url)] = (200, b"")
+
+    sintel = make_client(transport).get_data(MOVIES_ID)[1]
+
+    assert sintel.fallback_image("Backdrop") == url
+    assert sintel.fallback_image("Primary") == ""
+    assert transport.requests.count(fixture_key("HEAD", url)) == 1
+
+
+def test_invalid_tvdb_fallback_is_cached():
+    transport = LoggingTransport(FIXTURE)
+    with_tvdb_id(transport, "8d2e4c6a1b3f4e5d9c7b6a5f4e3d2c1b", "12345")
+    client = make_client(transport)
+
+    assert client.get_data(MOVIES_ID)[1].fallback_image("Backdrop") == ""
+    assert client.get_data(MOVIES_ID)[1].fallback_image("Backdrop") == ""
+    assert sum(key.startswith("HEAD ") for key in transport.requests) == 1
+
+
+@pytest.mark.parametrize(
+    "tvdb_id, media_type",
+    [("", "movie"), ("", "episode"), ("12345", "music"), ("12345", "other")],
+)
+def test_no_tvdb_fallback_without_id_or_for_other_libraries(tvdb_id, media_type):
+    transport = LoggingTransport(FIXTURE)
+
+    assert make_client(transport).get_tvdb_images(tvdb_id, "poster", media_type) is None
+    assert transport.requests == []
+
+
+def test_scheduler_limits_rate_across_threads():
+    scheduler = RequestScheduler(rate=50, burst=2)
+    times = []
+    lock = threading.Lock()
+
+    def request():
+        scheduler.acquire()
+        with lock:
+            times.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    times.sort()
+    # Two requests go out as a burst, the other six wait 20 ms each.
+    assert times[1] - start < 0.05
+    assert times[-1] - start >= 6 / 50 - 0.01
+    assert all(later - earlier >= 1 / 50 - 0.01 for earlier, later in zip(times[2:], times[3:]))
+
+
+def test_scheduler_without_rate_does_not_wait():
+    scheduler = RequestScheduler(rate=0, burst=1)
+    start = time.monotonic()
+    for _ in range(100):
+        scheduler.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_requests_are_sent_metadata_posters_fanart():
+    transport = LoggingTransport(FIXTURE)
+    make_client(transport).get_data(MOVIES_ID)
+
+    kinds = [
+        "Latest" if "/Items/Latest" in key else key.split("/Images/")[1].split("?")[0]
+        for key in transport.requests
+    ]
+    assert kinds == ["Latest", "Primary", "Primary", "Primary", "Backdrop"]
@@ -0,0 +1,83 @@
+"""Incremental decoding of Latest response bodies."""
+import json
+
+import pytest
+
+from custom_components.jellyfin_upcoming_media.client import iter_json_array
+
+PAYLOAD = json.dumps(
+    [
+        {"Name": "Amélie", "Id": "1", "Tags": ["a", "b"], "Nested": {"x": [1, {"y": None}]}},
+        'quote "] and backslash \\ inside',
+        "日本語 ✓ 🎬",
+        15.5,
+        -1e3,
+        0,
+        1.25e-2,
+        123456789,
+        True,
+        False,
+        None,
+        [],
+        {},
+    ],
+    ensure_ascii=False,
+).encode()
+EXPECTED = json.loads(PAYLOAD)
+
+
+def decode(chunks, limit):
+    return list(iter_json_array(chunks, limit))
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7, len(EXPECTED), len(EXPECTED) + 5])
+def test_split_at_every_offset(limit):
+    for offset in range(len(PAYLOAD) + 1):
+        chunks = [PAYLOAD[:offset], PAYLOAD[offset:]]
+        assert decode(chunks, limit) == EXPECTED[:limit], offset
+
+
+def test_one_byte_chunks():
+    chunks = [PAYLOAD[i : i + 1] for i in range(len(PAYLOAD))]
+    assert decode(chunks, len(EXPECTED)) == EXPECTED
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [
+        ([b"[15.", b"5]"], [15.5]),
+        ([b"[1e", b"3]"], [1000.0]),
+        ([b"[1", b"2, 3]"], [12, 3]),
+        ([b"[tr", b"ue, nu", b"ll]"], [True, None]),
+        ([b"[ 1 ,\n2 ]"], [1, 2]),
+    ],
+)
+def test_split_scalars(chunks, expected):
+    assert decode(chunks, 10) == expected
+
+
+def test_stops_at_limit_without_reading_the_rest():
+    def chunks():
+        yield b'[{"a": 1}, {"b": 2},'
+        raise AssertionError("read past the limit")
+
+    assert decode(chunks(), 2) == [{"a": 1}, {"b": 2}]
+
+
+def test_truncated_bodies():
+    # With a limit above the element count only the closing bracket ends
+    # the array, so every truncation is reported.
+    for offset in range(len(PAYLOAD)):
+        with pytest.raises(ValueError):
+            decode([PAYLOAD[:offset]], len(EXPECTED) + 1)
+
+
+@pytest.mark.parametrize("chunks", [[], [b""], [b"["], [b"[1"], [b'[{"a": 1}']])
+def test_empty_and_truncated_bodies(chunks):
+    with pytest.raises(ValueError):
+        decode(chunks, 5)
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        decode([b'{"Items": []}'], 5)
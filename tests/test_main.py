@@ -0,0 +1,23 @@
+"""Command line arguments."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.jellyfin_upcoming_media.__main__ import parse_args
+from custom_components.jellyfin_upcoming_media.client import DEFAULT_BURST, DEFAULT_RATE_LIMIT
+
+
+def test_defaults_match_the_integration():
+    args = parse_args(["--replay", "scan.zip"])
+
+    assert args.rate_limit == DEFAULT_RATE_LIMIT
+    assert args.rate_limit_burst == DEFAULT_BURST
+    assert args.image_format == "jpeg"
+
+
+def test_unknown_image_format_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        parse_args(["--replay", "scan.zip", "--image-format", "png"])
+
+    assert exc_info.value.code == 2
+    assert "invalid choice: 'png'" in capsys.readouterr().err
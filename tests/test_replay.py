@@ -0,0 +1,138 @@
+"""Replay a recorded Jellyfin scan through the client and the sensors."""
+import json
+import logging
+import os
+import zipfile
+from urllib.parse import urlsplit
+
+import pytest
+
+from custom_components.jellyfin_upcoming_media.client import JellyfinClient
+from custom_components.jellyfin_upcoming_media.transport import (
+    FixtureResponse,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "jellyfin_latest.zip")
+MOVIES_ID = "f137a2dd21bbc1b99aa5c0f6bf02a805"
+SHOWS_ID = "a656b907eb3a73532e40e44b968d0225"
+
+
+def make_client(max_items=5, transport=None, api_key="key", user_id="user"):
+    return JellyfinClient(
+        "localhost", api_key, False, 8096, max_items, user_id, True,
+        rate_limit=0, transport=transport or ReplayTransport(FIXTURE),
+    )
+
+
+def test_get_data_movies():
+    items = make_client().get_data(MOVIES_ID)
+
+    assert [item.name for item in items] == ["Big Buck Bunny", "Sintel"]
+    bunny, sintel = items
+    assert bunny.runtime == 9
+    assert bunny.release == "Released 2008-05-20"
+    assert bunny.rating == "★ 6.5"
+    assert bunny.studio == "Blender Foundation"
+    assert bunny.trailer == "https://www.youtube.com/watch?v=aqz-KE-bpKQ"
+    assert bunny.image("Primary").startswith(b"\xff\xd8")
+    assert bunny.image("Backdrop").startswith(b"\xff\xd8")
+    assert sintel.image("Backdrop") == b""
+    assert sintel.airdate == "2024-05-01T09:00:00.0000000Z"
+
+
+def test_get_data_episodes():
+    items = make_client().get_data(SHOWS_ID)
+
+    assert [item.number for item in items] == ["S01E01", ""]
+    assert [item.season for item in items] == [1, 1]
+    assert all(item.image("Primary_parent") for item in items)
+
+
+def test_replay_warns_about_different_options(caplog):
+    with caplog.at_level(logging.WARNING):
+        ReplayTransport(FIXTURE, options={"max": 2, "episodes": True})
+
+    assert "recorded with max=5 but is replayed with max=2" in caplog.text
+    assert "episodes" not in caplog.text
+
+
+def test_replay_warns_about_unrecorded_requests(caplog):
+    client = make_client(max_items=2)
+    with caplog.at_level(logging.WARNING):
+        assert client.get_data(MOVIES_ID) is None
+
+    assert "No recorded response" in caplog.text
+
+
+def test_create_sensors(tmp_path):
+    pytest.importorskip("homeassistant")
+    from custom_components.jellyfin_upcoming_media.__main__ import run_scan
+    from custom_components.jellyfin_upcoming_media.sensor import PLATFORM_SCHEMA
+
+    config = PLATFORM_SCHEMA(
+        {"platform": "jellyfin_upcoming_media", "api_key": "key", "user_id": "user", "rate_limit": 0}
+    )
+    report = run_scan(config, str(tmp_path), ReplayTransport(FIXTURE))
+
+    assert [(sensor["entity_id"], sensor["state"], sensor["cards"]) for sensor in report["sensors"]] == [
+        ("sensor.jellyfin_latest_movies", "Online", 2),
+        ("sensor.jellyfin_latest_shows", "Online", 2),
+    ]
+    image_dir = tmp_path / "www" / "community" / "jellyfin_upcoming_media"
+    assert (image_dir / "poster_movie_1.jpg").read_bytes().startswith(b"\xff\xd8")
+    assert (image_dir / "fanart_movie_1.jpg").exists()
+    assert not (image_dir / "fanart_movie_2.jpg").exists()
+
+
+class StubServer:
+    """Answer the requests of a scan like a small Jellyfin server."""
+
+    VIEWS = [{"Name": "Movies", "Id": "11b", "CollectionType": "movies"}]
+    LATEST = [
+        {
+            "Name": "Tears of Steel",
+            "Id": "7e57",
+            "Type": "Movie",
+            "ParentId": "11b",
+            "ImageTags": {"Primary": "aa"},
+            "BackdropImageTags": [],
+        }
+    ]
+
+    def get(self, url, **kwargs):
+        path = urlsplit(url).path
+        if path == "/UserViews":
+            return FixtureResponse(200, json.dumps({"Items": self.VIEWS}).encode())
+        if path.endswith("/Items/Latest"):
+            return FixtureResponse(200, json.dumps(self.LATEST).encode())
+        if path == "/Items/7e57/Images/Primary":
+            return FixtureResponse(200, b"poster bytes")
+        return FixtureResponse(404, b"")
+
+    def head(self, url, **kwargs):
+        return FixtureResponse(404, b"")
+
+
+def test_record_save_and_replay(tmp_path):
+    path = str(tmp_path / "scan.zip")
+    recording = RecordingTransport(path, StubServer(), options={"max": 5})
+    client = make_client(transport=recording, api_key="s3cret-key", user_id="0123456789abcdef")
+    client.get_view_categories()
+    recorded = client.get_data("11b")
+    recording.save()
+
+    with zipfile.ZipFile(path) as archive:
+        index = archive.read("index.json").decode()
+        assert json.loads(archive.read("options.json")) == {"max": 5}
+    assert "s3cret-key" not in index
+    assert "0123456789abcdef" not in index
+    assert "/Users/-/Items/Latest?" in index
+
+    client = make_client(transport=ReplayTransport(path))
+    assert client.get_view_categories() == StubServer.VIEWS
+    replayed = client.get_data("11b")
+
+    assert replayed == recorded
+    assert replayed[0].image("Primary") == b"poster bytes"
@@ -0,0 +1,85 @@
+"""Sensor update and render against a replayed scan."""
+import dataclasses
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.jellyfin_upcoming_media.client import JellyfinClient
+from custom_components.jellyfin_upcoming_media.sensor import (
+    CATEGORY_ID,
+    CATEGORY_NAME,
+    CATEGORY_TYPE,
+    DOMAIN_DATA,
+    JellyfinUpcomingMediaSensor,
+)
+from custom_components.jellyfin_upcoming_media.transport import ReplayTransport
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "jellyfin_latest.zip")
+MOVIES_ID = "f137a2dd21bbc1b99aa5c0f6bf02a805"
+
+
+class CountingTransport(ReplayTransport):
+    """Replay the fixture and count the requests made."""
+
+    requests = 0
+
+    def _replay(self, method, url):
+        self.requests += 1
+        return super()._replay(method, url)
+
+
+def make_sensor(config_dir, transport):
+    client = JellyfinClient(
+        "localhost", "key", False, 8096, 5, "user", True, rate_limit=0, transport=transport
+    )
+    hass = SimpleNamespace(
+        data={DOMAIN_DATA: {"client": client}},
+        config=SimpleNamespace(config_dir=str(config_dir)),
+    )
+    return JellyfinUpcomingMediaSensor(
+        hass, {CATEGORY_NAME: "Movies", CATEGORY_ID: MOVIES_ID, CATEGORY_TYPE: "Movies"}
+    )
+
+
+def test_render_makes_no_requests(tmp_path):
+    transport = CountingTransport(FIXTURE)
+    sensor = make_sensor(tmp_path, transport)
+
+    data = sensor.fetch_data()
+    requests = transport.requests
+    sensor.set_data(data)
+
+    assert transport.requests == requests
+    assert len(sensor.extra_state_attributes["data"]) == 3
+
+
+def test_unchanged_scan_writes_nothing(tmp_path, monkeypatch):
+    sensor = make_sensor(tmp_path, ReplayTransport(FIXTURE))
+    data = sensor.fetch_data()
+
+    assert sensor.set_data(data) is True
+    attributes = sensor.extra_state_attributes
+    image_dir = tmp_path / "www" / "community" / "jellyfin_upcoming_media"
+    assert sorted(path.name for path in image_dir.iterdir()) == [
+        "fanart_movie_1.jpg",
+        "poster_movie_1.jpg",
+        "poster_movie_2.jpg",
+    ]
+
+    written = []
+    monkeypatch.setattr(sensor, "store_image_bytes", lambda *args: written.append(args))
+    assert sensor.set_data(list(data)) is False
+    assert written == []
+    assert sensor.extra_state_attributes is attributes
+
+
+def test_items_without_dates_keep_a_stable_card(tmp_path):
+    sensor = make_sensor(tmp_path, ReplayTransport(FIXTURE))
+    data = [dataclasses.replace(item, airdate="") for item in sensor.fetch_data()]
+
+    assert sensor.set_data(data) is True
+    assert [card["airdate"] for card in sensor.extra_state_attributes["data"][1:]] == ["", ""]
+    assert sensor.set_data(data) is False